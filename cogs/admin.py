@@ -0,0 +1,157 @@
+# admin.py (봇 운영: 재시작 없이 코그 리로드)
+
+import os
+from typing import Dict, List
+
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+from db.statements import STATEMENTS
+
+ADMIN_ID = int(os.getenv("ADMIN_ID", "0"))
+
+
+class Admin(commands.Cog):
+    """
+    봇 운영자(ADMIN_ID) 전용 명령
+    - /코그리로드 <코그>: 코그를 다시 불러오고 바뀐 슬래시 명령만 동기화
+    - /캐시통계: 잔액 캐시 적중률 등
+    - /쿼리통계: 등록된 SQL 문장별 호출 수/시간
+    코그는 cog_unload 에서 스케줄러를 정리하고 bot.cog_state 로 메모리 상태를 넘깁니다.
+    """
+
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+
+    # ---------- 공통 ----------
+    async def _deny(self, interaction: discord.Interaction, text: str) -> None:
+        await interaction.response.send_message(text, ephemeral=True)
+
+    def _command_payloads(self) -> Dict[str, dict]:
+        """현재 트리의 전역 슬래시 명령 → 디스코드에 보낼 payload"""
+        return {cmd.name: cmd.to_dict(self.bot.tree) for cmd in self.bot.tree.get_commands()}
+
+    async def _sync_changed(self, before: Dict[str, dict], after: Dict[str, dict]) -> List[str]:
+        """바뀐/추가된 명령은 upsert, 사라진 명령은 삭제 (전체 재동기화 없이)"""
+        app_id = self.bot.application_id
+        changes = []
+
+        for name, payload in after.items():
+            if before.get(name) != payload:
+                await self.bot.http.upsert_global_command(app_id, payload)
+                changes.append(f"`/{name}` {'변경' if name in before else '추가'}")
+
+        removed = set(before) - set(after)
+        if removed:
+            for cmd in await self.bot.tree.fetch_commands():
+                if cmd.name in removed:
+                    await self.bot.http.delete_global_command(app_id, cmd.id)
+                    changes.append(f"`/{cmd.name}` 삭제")
+
+        return changes
+
+    # ---------- 명령어 ----------
+    @app_commands.command(name="코그리로드", description="운영자 전용: 재시작 없이 코그를 다시 불러옵니다.")
+    async def cmd_reload(self, interaction: discord.Interaction, 코그: str):
+        if interaction.user.id != ADMIN_ID:
+            await self._deny(interaction, "⚠️ 이 명령어는 **봇 운영자**만 사용할 수 있어요.")
+            return
+
+        if self.bot.interactions_only:
+            # 로드밸런서가 고른 워커 하나만 바뀌므로 게이트웨이 프로세스에서만 허용
+            await self._deny(interaction, "⚠️ 코그 리로드는 게이트웨이 프로세스에서만 할 수 있어요.")
+            return
+
+        name = 코그 if 코그.startswith("cogs.") else f"cogs.{코그}"
+        if not name[5:].isidentifier() or not os.path.exists(os.path.join("cogs", f"{name[5:]}.py")):
+            await self._deny(interaction, f"❌ `{name}` 코그 파일이 없어요.")
+            return
+
+        await interaction.response.defer(ephemeral=True)
+
+        before = self._command_payloads()
+        try:
+            if name in self.bot.extensions:
+                await self.bot.reload_extension(name)
+            else:
+                await self.bot.load_extension(name)
+        except commands.ExtensionError as e:
+            # reload_extension 은 실패 시 이전 모듈로 되돌림
+            print(f"❌ 코그 리로드 오류: {e}")
+            await interaction.followup.send(f"⚠️ `{name}` 리로드 실패: {e}", ephemeral=True)
+            return
+        finally:
+            # 되돌리기까지 실패해 아무도 받아가지 않은 상태(LISTEN 연결 등)는 여기서 정리
+            self.bot.discard_cog_state()
+
+        try:
+            changes = await self._sync_changed(before, self._command_payloads())
+        except discord.HTTPException as e:
+            print(f"❌ 명령어 동기화 오류: {e}")
+            await interaction.followup.send(f"⚠️ `{name}` 리로드는 됐지만 명령어 동기화에 실패했어요.", ephemeral=True)
+            return
+
+        embed = discord.Embed(
+            title="코그 리로드 🔄",
+            description=f"`{name}` 다시 불러옴\n\n" + ("\n".join(changes) if changes else "동기화할 명령어 변경 없음"),
+            color=discord.Color.teal()
+        )
+        await interaction.followup.send(embed=embed, ephemeral=True)
+
+    @app_commands.command(name="캐시통계", description="운영자 전용: 잔액 캐시 상태를 확인합니다.")
+    async def cmd_cache_stats(self, interaction: discord.Interaction):
+        if interaction.user.id != ADMIN_ID:
+            await self._deny(interaction, "⚠️ 이 명령어는 **봇 운영자**만 사용할 수 있어요.")
+            return
+
+        bank = self.bot.get_cog("Bank")
+        if bank is None:
+            await self._deny(interaction, "⚠️ Bank 코그가 로드되어 있지 않아요.")
+            return
+
+        st = bank.balance_cache.stats()
+        off = "" if st["enabled"] else "⚠️ **꺼짐** (무효화 채널 끊김, DB 직접 조회 중)\n"
+        embed = discord.Embed(
+            title="잔액 캐시 📦",
+            description=(
+                f"{off}크기: **{st['size']:,} / {st['maxsize']:,}**\n"
+                f"적중: **{st['hits']:,}** • 미스: **{st['misses']:,}** • 적중률: **{st['hit_rate']:.1%}**\n"
+                f"밀려남: **{st['evictions']:,}** • 무효화: **{st['invalidations']:,}**"
+            ),
+            color=discord.Color.blue()
+        )
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+    @app_commands.command(name="쿼리통계", description="운영자 전용: SQL 문장별 호출 수/시간을 확인합니다.")
+    async def cmd_query_stats(self, interaction: discord.Interaction):
+        if interaction.user.id != ADMIN_ID:
+            await self._deny(interaction, "⚠️ 이 명령어는 **봇 운영자**만 사용할 수 있어요.")
+            return
+
+        rows = sorted(STATEMENTS.values(), key=lambda st: st.total_ms, reverse=True)
+        lines = []
+        for st in rows:
+            s = st.stats()
+            if not s["calls"]:
+                continue
+            line = f"`{st.name}` {s['calls']:,}회 • 평균 {s['avg_ms']:.2f}ms • 최대 {s['max_ms']:.1f}ms"
+            if s["errors"]:
+                line += f" • 오류 {s['errors']:,}"
+            lines.append(line)
+
+        embed = discord.Embed(
+            title="쿼리 통계 🧮",
+            description="\n".join(lines) if lines else "아직 실행된 문장이 없어요.",
+            color=discord.Color.blue()
+        )
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+    @cmd_reload.autocomplete("코그")
+    async def _cog_autocomplete(self, interaction: discord.Interaction, current: str):
+        names = sorted(f[:-3] for f in os.listdir("./cogs") if f.endswith(".py"))
+        return [app_commands.Choice(name=n, value=n) for n in names if current in n][:25]
+
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(Admin(bot))
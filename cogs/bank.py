@@ -1,8 +1,11 @@
 # bank.py (거부/오류 메시지: 에페메럴 텍스트 통일)
 
+import csv
 import datetime
+import io
 import os
 import random
+import re
 
 import discord
 from discord import app_commands
@@ -11,18 +14,111 @@ from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from dotenv import load_dotenv
 from typing import List, Tuple
 
+from db import queries as q
+from db.balance_cache import PROCESS_TOKEN, BalanceCache, BalanceInvalidationListener
+
 load_dotenv()
 ADMIN_ID = int(os.getenv("ADMIN_ID", "0"))
+BALANCE_CACHE_SIZE = int(os.getenv("BALANCE_CACHE_SIZE", "10000"))
+BATCH_GRANT_MAX = 500                 # /일괄지급 한 번에 최대 인원
+BATCH_GRANT_FILE_MAX = 64 * 1024      # CSV 첨부 최대 크기 (바이트)
+BATCH_GRANT_ECHO_MAX = 32             # 오류 메시지에 다시 보여줄 입력 길이
+DENY_MESSAGE_MAX = 2000               # 디스코드 메시지 길이 제한
+BATCH_GRANT_AMOUNT_MAX = 10 ** 12     # /일괄지급 1인당 최대 금액
+BATCH_GRANT_TOTAL_MAX = 10 ** 15      # /일괄지급 한 번의 총액 상한 (잔액 BIGINT 넘침 방지)
+BIGINT_MAX = 2 ** 63 - 1
+
+# \d 는 유니코드 숫자(٣ 등)도 받으므로 ASCII 숫자만, int() 전에 자릿수도 제한
+_MENTION_RE = re.compile(r"^<@!?([0-9]{1,20})>$")
+_UID_RE = re.compile(r"^[0-9]{1,20}$")
+_AMOUNT_RE = re.compile(r"^-?[0-9]{1,20}$")
+
+
+def parse_grant_rows(rows: List[List[str]]) -> Tuple[List[Tuple[int, int, int]], List[str]]:
+    """
+    [대상, 금액] 행들 → ([(줄번호, uuid, 금액)], [오류])
+    대상은 멘션(<@id>) 또는 숫자 ID. 첫 줄이 머리글이면 건너뜀.
+    """
+    entries, errors = [], []
+    for line_no, row in enumerate(rows, start=1):
+        cells = [c.strip() for c in row if c.strip()]
+        if not cells:
+            continue
+        if len(cells) != 2:
+            errors.append(f"{line_no}줄: `대상, 금액` 형식이 아니에요.")
+            continue
+        target, amount = cells
+        m = _MENTION_RE.match(target)
+        uid = m.group(1) if m else target
+        # 정규식을 통과한 것만 int() → 변환 예외가 날 수 없음
+        if not _UID_RE.match(uid) or int(uid) > BIGINT_MAX:
+            if line_no == 1 and not _AMOUNT_RE.match(amount):
+                continue  # 머리글
+            echo = target if len(target) <= BATCH_GRANT_ECHO_MAX else target[:BATCH_GRANT_ECHO_MAX] + "…"
+            errors.append(f"{line_no}줄: 대상 `{discord.utils.escape_markdown(echo)}` 을(를) 알 수 없어요.")
+            continue
+        if not _AMOUNT_RE.match(amount) or not 0 < int(amount) <= BATCH_GRANT_AMOUNT_MAX:
+            errors.append(f"{line_no}줄: 금액은 **1 ~ {BATCH_GRANT_AMOUNT_MAX:,}** 사이 정수여야 해요.")
+            continue
+        entries.append((line_no, int(uid), int(amount)))
+
+    total = sum(amount for _, _, amount in entries)
+    if total > BATCH_GRANT_TOTAL_MAX:
+        errors.append(f"총 지급액은 **{BATCH_GRANT_TOTAL_MAX:,}령** 이하여야 해요. (입력: {total:,}령)")
+    return entries, errors
+
 
 class Bank(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
-        self.scheduler = AsyncIOScheduler()
-        self.scheduler.start()
+        # 마이그레이션이 실패하면 아직 아무것도 띄우지 않았고, 넘겨받은 상태도 cog_state 에 그대로 남음
         self._create_or_migrate_tables()
 
-        # 1분마다 보이스 보상
-        self.scheduler.add_job(self.pay_voice_rewards, "interval", minutes=1, max_instances=1, coalesce=True)
+        # 리로드 전 코그가 넘겨준 상태 (없으면 빈 dict)
+        state = bot.cog_state.pop(self.qualified_name, {})
+        self.balance_listener: BalanceInvalidationListener | None = state.get("balance_listener")
+        self.scheduler = AsyncIOScheduler()
+
+        try:
+            self.scheduler.start()
+
+            # 잔액 캐시 (write-through) + 다른 프로세스의 변경 알림 수신
+            # BalanceCache 는 __len__ 이 있어 비어 있으면 거짓 → `or` 로 고르면 리스너와 다른 캐시가 됨
+            self.balance_cache: BalanceCache | None = state.get("balance_cache")
+            if self.balance_cache is None:
+                self.balance_cache = BalanceCache(BALANCE_CACHE_SIZE)
+            if self.balance_listener is None:
+                self.balance_listener = BalanceInvalidationListener(self.balance_cache, self.bot.new_db_connection)
+                self.balance_listener.start()
+            assert self.balance_listener.cache is self.balance_cache
+
+            # 1분마다 보이스 보상 (리로드 시 기존 주기를 이어받아 중복/누락 없이)
+            # HTTP 인터랙션 워커는 보이스 상태를 모르므로 게이트웨이 프로세스만 지급
+            # next_run_time=None 은 '일시정지로 추가'라서, 이어받을 값이 있을 때만 넘김
+            if not bot.interactions_only:
+                resume = {"next_run_time": state["voice_next_run"]} if state.get("voice_next_run") else {}
+                self.scheduler.add_job(
+                    self.pay_voice_rewards, "interval", minutes=1, max_instances=1, coalesce=True,
+                    id="voice_rewards", **resume,
+                )
+        except Exception:
+            # 넘겨받은(또는 새로 연) LISTEN 연결이 주인 없이 남지 않게
+            if self.balance_listener is not None:
+                self.balance_listener.stop()
+            if self.scheduler.running:
+                self.scheduler.shutdown(wait=False)
+            raise
+
+    async def cog_unload(self) -> None:
+        job = self.scheduler.get_job("voice_rewards")
+        self.bot.cog_state[self.qualified_name] = {
+            "voice_next_run": job.next_run_time if job else None,
+            "balance_cache": self.balance_cache,
+            "balance_listener": self.balance_listener,
+            # 다음 인스턴스가 안 받아가면(언로드만 됐거나 리로드 실패) bot.discard_cog_state 가 호출
+            "discard": self.balance_listener.stop,
+        }
+        self.scheduler.shutdown(wait=False)
 
     # ---------- 공통 헬퍼 ----------
     async def _deny(self, interaction: discord.Interaction, text: str) -> None:
@@ -42,14 +138,34 @@ class Bank(commands.Cog):
         """)
         cur.execute("ALTER TABLE users ADD COLUMN IF NOT EXISTS last_sobok TIMESTAMP NULL")
         cur.execute("ALTER TABLE users ADD COLUMN IF NOT EXISTS last_chat_reward_at TIMESTAMP NULL")
+        # 순위 상위 N / 내 순위 계산용 (인덱스 전용 스캔)
+        cur.execute("CREATE INDEX IF NOT EXISTS users_money_rank_idx ON users (money DESC, uuid ASC)")
         self.bot.conn.commit()
 
     async def ensure_user(self, user_id: int) -> None:
+        if user_id in self.balance_cache:
+            return  # 캐시에 있으면 이미 존재하는 사용자
         cur = self.bot.cursor
-        cur.execute("SELECT 1 FROM users WHERE uuid=%s", (user_id,))
+        q.USER_EXISTS.run(cur, (user_id,))
         if not cur.fetchone():
-            cur.execute("INSERT INTO users (uuid) VALUES (%s)", (user_id,))
+            q.USER_INSERT.run(cur, (user_id,))
+            self.bot.conn.commit()
+
+    async def get_balance(self, user_id: int) -> int:
+        """캐시 우선, 없으면 (필요 시 사용자 생성 후) DB 한 번"""
+        bal = self.balance_cache.get(user_id)
+        if bal is None:
+            cur = self.bot.cursor
+            q.USER_ENSURE_BALANCE.run(cur, (user_id, user_id))
+            bal = cur.fetchone()[0] or 0
             self.bot.conn.commit()
+            self.balance_cache.set(user_id, bal)
+        return bal
+
+    def _cache_rows(self, rows: List[Tuple]) -> None:
+        """RETURNING uuid, money, ... 결과를 캐시에 반영"""
+        for uid, money, *_ in rows:
+            self.balance_cache.set(uid, money)
 
     # ---------- 채널 체크 ----------
     async def check_bot_channel(self, interaction: discord.Interaction) -> bool:
@@ -62,6 +178,14 @@ class Bank(commands.Cog):
             return False
         return True
 
+    # ---------- 멤버 목록 체크 ----------
+    async def check_members_ready(self, interaction: discord.Interaction) -> bool:
+        """HTTP 인터랙션 워커는 멤버 목록을 백그라운드로 채우므로, 다 찰 때까지 거절"""
+        if self.bot.members_ready(interaction.guild):
+            return True
+        await self._deny(interaction, "⏳ 서버 멤버 목록을 아직 불러오는 중이에요. 잠시 후 다시 시도해주세요.")
+        return False
+
     # ---------- 관리자 체크 ----------
     async def check_admin(self, interaction: discord.Interaction) -> bool:
         # 1) ENV ADMIN_ID or 서버 관리자
@@ -82,11 +206,7 @@ class Bank(commands.Cog):
             return
 
         member = 사용자 or interaction.user
-        await self.ensure_user(member.id)
-
-        cur = self.bot.cursor
-        cur.execute("SELECT money FROM users WHERE uuid=%s", (member.id,))
-        bal = cur.fetchone()[0]
+        bal = await self.get_balance(member.id)
 
         # 성공 메시지는 겨울 테마 임베드 유지
         embed = discord.Embed(
@@ -106,25 +226,32 @@ class Bank(commands.Cog):
 
         sender = interaction.user
         receiver = 대상
-        await self.ensure_user(sender.id)
-        await self.ensure_user(receiver.id)
-
-        cur = self.bot.cursor
-        cur.execute("SELECT money FROM users WHERE uuid=%s", (sender.id,))
-        sender_money = cur.fetchone()[0]
 
-        if sender_money < 금액:
+        # 캐시로 명백한 잔액 부족은 DB 없이 거절 (최종 판단은 아래 조건부 UPDATE)
+        cached = self.balance_cache.get(sender.id)
+        if cached is not None and cached < 금액:
             await self._deny(interaction, "❌ 잔액이 부족해요.")
             return
 
+        cur = self.bot.cursor
         try:
-            cur.execute("UPDATE users SET money = money - %s WHERE uuid=%s", (금액, sender.id))
-            cur.execute("UPDATE users SET money = money + %s WHERE uuid=%s", (금액, receiver.id))
+            q.MONEY_SPEND.run(cur, (금액, sender.id, 금액, PROCESS_TOKEN))
+            spent = cur.fetchone()
+            if spent is None:
+                self.bot.conn.rollback()
+                await self._deny(interaction, "❌ 잔액이 부족해요.")
+                return
+            q.MONEY_ADD.run(cur, (receiver.id, 금액, PROCESS_TOKEN))
+            received = cur.fetchone()
             self.bot.conn.commit()
         except Exception:
             self.bot.conn.rollback()
+            self.balance_cache.invalidate(sender.id)
+            self.balance_cache.invalidate(receiver.id)
             await self._deny(interaction, "⚠️ 송금 처리 중 문제가 발생했어요.")
             return
+        self.balance_cache.set(sender.id, spent[0])
+        self.balance_cache.set(receiver.id, received[0])
 
         embed = discord.Embed(
             title="송금 ☃️",
@@ -159,17 +286,16 @@ class Bank(commands.Cog):
 
         # 개별 사용자 지급
         if 대상 is not None:
-            await self.ensure_user(대상.id)
             try:
-                cur.execute("UPDATE users SET money = money + %s WHERE uuid=%s", (금액, 대상.id))
+                q.MONEY_ADD.run(cur, (대상.id, 금액, PROCESS_TOKEN))
+                bal = cur.fetchone()[0]
                 self.bot.conn.commit()
             except Exception:
                 self.bot.conn.rollback()
+                self.balance_cache.invalidate(대상.id)
                 await self._deny(interaction, "⚠️ 지급 처리 중 문제가 발생했어요.")
                 return
-
-            cur.execute("SELECT money FROM users WHERE uuid=%s", (대상.id,))
-            bal = cur.fetchone()[0]
+            self.balance_cache.set(대상.id, bal)
 
             desc = f"{대상.mention} **{금액:,}령** 지급되었습니다.\n잔액: **{bal:,}령**"
             if 사유:
@@ -184,23 +310,25 @@ class Bank(commands.Cog):
             return
 
         # 역할 전체 지급
+        if not await self.check_members_ready(interaction):
+            return
         members = [m for m in interaction.guild.members if (역할 in m.roles) and (not m.bot)]
         if not members:
             await self._deny(interaction, "⚠️ 해당 역할을 가진 **사람**(봇 제외)이 없어요.")
             return
 
-        # 사용자 보장 + 일괄 지급
+        # 사용자 보장 + 일괄 지급 (한 문장)
         try:
-            for m in members:
-                await self.ensure_user(m.id)
-            params = [(금액, m.id) for m in members]
-            # executemany로 일괄 업데이트
-            cur.executemany("UPDATE users SET money = money + %s WHERE uuid=%s", params)
+            q.MONEY_ADD_MANY.run(cur, ([m.id for m in members], 금액, PROCESS_TOKEN))
+            rows = cur.fetchall()
             self.bot.conn.commit()
         except Exception:
             self.bot.conn.rollback()
+            for m in members:
+                self.balance_cache.invalidate(m.id)
             await self._deny(interaction, "⚠️ 역할 지급 처리 중 문제가 발생했어요.")
             return
+        self._cache_rows(rows)
 
         총인원 = len(members)
         총액 = 금액 * 총인원
@@ -215,6 +343,103 @@ class Bank(commands.Cog):
         )
         await interaction.response.send_message(embed=embed)
 
+    @app_commands.command(name="일괄지급", description="관리진 전용: 여러 대상에게 각각 다른 금액을 한 번에 지급합니다.")
+    @app_commands.describe(
+        목록="`대상, 금액` 을 줄바꿈 또는 ; 로 구분 (예: @철수, 100; @영희, 50)",
+        파일="`대상,금액` 형식의 CSV 파일",
+    )
+    async def cmd_batch_grant(
+            self,
+            interaction: discord.Interaction,
+            사유: str,
+            목록: str | None = None,
+            파일: discord.Attachment | None = None,
+    ):
+        # 권한/채널 체크는 전체에 대해 한 번만
+        if not await self.check_bot_channel(interaction):
+            return
+        if not await self.check_admin(interaction):
+            return
+        if (목록 is None) == (파일 is None):
+            await self._deny(interaction, "⚠️ `목록` **또는** `파일` 중 하나만 지정해주세요.")
+            return
+
+        # 1) 입력 → 행
+        if 파일 is not None:
+            if 파일.size > BATCH_GRANT_FILE_MAX:
+                await self._deny(interaction, f"❌ 파일은 **{BATCH_GRANT_FILE_MAX // 1024}KB** 이하만 받을 수 있어요.")
+                return
+            try:
+                text = (await 파일.read()).decode("utf-8-sig")
+            except (discord.HTTPException, UnicodeDecodeError):
+                await self._deny(interaction, "❌ 파일을 읽을 수 없어요. UTF-8 CSV 인지 확인해주세요.")
+                return
+            rows = list(csv.reader(io.StringIO(text)))
+        else:
+            rows = [re.split(r"[,\s]+", part.strip()) for part in re.split(r"[;\n]", 목록)]
+
+        # 2) 전체 검증 (하나라도 틀리면 아무것도 지급하지 않음)
+        if not await self.check_members_ready(interaction):
+            return
+        entries, errors = parse_grant_rows(rows)
+        seen = {}
+        for line_no, uid, _ in entries:
+            if uid in seen:
+                errors.append(f"{line_no}줄: {seen[uid]}줄과 대상이 중복돼요.")
+                continue
+            seen[uid] = line_no
+            member = interaction.guild.get_member(uid)
+            if member is None:
+                errors.append(f"{line_no}줄: 서버에 없는 사용자 `{uid}`")
+            elif member.bot:
+                errors.append(f"{line_no}줄: 봇 {member.mention} 에게는 지급할 수 없어요.")
+        if not entries and not errors:
+            errors.append("지급할 대상이 없어요.")
+        elif len(entries) > BATCH_GRANT_MAX:
+            errors.append(f"한 번에 최대 **{BATCH_GRANT_MAX}명**까지 지급할 수 있어요. (입력: {len(entries)}명)")
+        if errors:
+            shown = "\n".join(errors[:10])
+            more = f"\n…외 {len(errors) - 10}건" if len(errors) > 10 else ""
+            text = f"❌ 입력을 확인해주세요. 아무것도 지급되지 않았어요.\n{shown}{more}"
+            if len(text) > DENY_MESSAGE_MAX:
+                text = text[:DENY_MESSAGE_MAX - 1] + "…"
+            await self._deny(interaction, text)
+            return
+
+        # 3) 한 문장으로 사용자 보장 + 지급
+        uids = [uid for _, uid, _ in entries]
+        amounts = [amount for _, _, amount in entries]
+        cur = self.bot.cursor
+        try:
+            q.MONEY_ADD_EACH.run(cur, (uids, amounts, PROCESS_TOKEN))
+            rows = cur.fetchall()
+            self.bot.conn.commit()
+        except Exception:
+            self.bot.conn.rollback()
+            for uid in uids:
+                self.balance_cache.invalidate(uid)
+            await self._deny(interaction, "⚠️ 일괄 지급 처리 중 문제가 발생했어요.")
+            return
+        self._cache_rows(rows)
+
+        # 4) 요약 임베드 1개
+        lines = [f"<@{uid}> **{amount:,}령**" for uid, amount in zip(uids, amounts)]
+        shown = lines[:20]
+        if len(lines) > 20:
+            shown.append(f"…외 {len(lines) - 20}명")
+        desc = (
+            f"**{len(uids)}명**에게 일괄 지급 완료.\n총 지급: **{sum(amounts):,}령**\n\n" + "\n".join(shown)
+        )
+        if 사유:
+            desc += f"\n\n📝 사유: {discord.utils.escape_markdown(사유)}"
+
+        embed = discord.Embed(
+            title="일괄 지급 💎",
+            description=desc,
+            color=discord.Color.teal(),
+        )
+        await interaction.response.send_message(embed=embed)
+
     @app_commands.command(name="회수", description="관리진 전용: 대상(또는 역할 전체)에게서 nn령 회수합니다.")
     async def cmd_withdraw(
             self,
@@ -240,17 +465,16 @@ class Bank(commands.Cog):
 
         # 개별 사용자 회수
         if 대상 is not None:
-            await self.ensure_user(대상.id)
             try:
-                cur.execute("UPDATE users SET money = GREATEST(money - %s, 0) WHERE uuid=%s", (금액, 대상.id))
+                q.MONEY_SUB_FLOOR.run(cur, (대상.id, 금액, PROCESS_TOKEN))
+                bal = cur.fetchone()[0]
                 self.bot.conn.commit()
             except Exception:
                 self.bot.conn.rollback()
+                self.balance_cache.invalidate(대상.id)
                 await self._deny(interaction, "⚠️ 회수 처리 중 문제가 발생했어요.")
                 return
-
-            cur.execute("SELECT money FROM users WHERE uuid=%s", (대상.id,))
-            bal = cur.fetchone()[0]
+            self.balance_cache.set(대상.id, bal)
 
             desc = f"{대상.mention} **{금액:,}령** 회수되었습니다.\n잔액: **{bal:,}령**"
             if 사유:
@@ -265,21 +489,24 @@ class Bank(commands.Cog):
             return
 
         # 역할 전체 회수
+        if not await self.check_members_ready(interaction):
+            return
         members = [m for m in interaction.guild.members if (역할 in m.roles) and (not m.bot)]
         if not members:
             await self._deny(interaction, "⚠️ 해당 역할을 가진 **사람**(봇 제외)이 없어요.")
             return
 
         try:
-            for m in members:
-                await self.ensure_user(m.id)
-            params = [(금액, m.id) for m in members]
-            cur.executemany("UPDATE users SET money = GREATEST(money - %s, 0) WHERE uuid=%s", params)
+            q.MONEY_SUB_FLOOR_MANY.run(cur, ([m.id for m in members], 금액, PROCESS_TOKEN))
+            rows = cur.fetchall()
             self.bot.conn.commit()
         except Exception:
             self.bot.conn.rollback()
+            for m in members:
+                self.balance_cache.invalidate(m.id)
             await self._deny(interaction, "⚠️ 역할 회수 처리 중 문제가 발생했어요.")
             return
+        self._cache_rows(rows)
 
         총인원 = len(members)
         총액_명목 = 금액 * 총인원  # 실제로는 GREATEST로 인해 총 회수액이 이보다 적을 수 있음
@@ -306,8 +533,9 @@ class Bank(commands.Cog):
         await self.ensure_user(user.id)
 
         cur = self.bot.cursor
-        cur.execute("SELECT money, last_sobok FROM users WHERE uuid=%s", (user.id,))
+        q.USER_SOBOK.run(cur, (user.id,))
         money, last_sobok = cur.fetchone()
+        self.balance_cache.set(user.id, money or 0)
         now = datetime.datetime.now()
         cooldown = 30 * 60
 
@@ -319,15 +547,15 @@ class Bank(commands.Cog):
 
         reward = random.randint(1, 100)
         try:
-            cur.execute(
-                "UPDATE users SET money = money + %s, last_sobok = %s WHERE uuid=%s",
-                (reward, now, user.id)
-            )
+            q.SOBOK_REWARD.run(cur, (reward, now, user.id, PROCESS_TOKEN))
+            bal = cur.fetchone()[0]
             self.bot.conn.commit()
         except Exception:
             self.bot.conn.rollback()
+            self.balance_cache.invalidate(user.id)
             await self._deny(interaction, "⚠️ 소복 사용 중 문제가 발생했어요.")
             return
+        self.balance_cache.set(user.id, bal)
 
         embed = discord.Embed(
             title="소복 ❄️",
@@ -351,22 +579,11 @@ class Bank(commands.Cog):
         cur = self.bot.cursor
         try:
             # 상위 10명
-            cur.execute("""
-                SELECT uuid, money
-                FROM users
-                ORDER BY money DESC, uuid ASC
-                LIMIT 10
-            """)
+            q.LEADERBOARD_TOP.run(cur)
             top = cur.fetchall()
 
             # 내 순위
-            cur.execute("""
-                SELECT rnk, money FROM (
-                  SELECT uuid, money, RANK() OVER (ORDER BY money DESC, uuid ASC) AS rnk
-                  FROM users
-                ) t
-                WHERE uuid = %s
-            """, (user.id,))
+            q.LEADERBOARD_MY_RANK.run(cur, (user.id,))
             me = cur.fetchone()
             my_rank = me[0] if me else None
             my_money = me[1] if me else 0
@@ -407,7 +624,7 @@ class Bank(commands.Cog):
         await self.ensure_user(user.id)
 
         cur = self.bot.cursor
-        cur.execute("SELECT last_chat_reward_at FROM users WHERE uuid=%s", (user.id,))
+        q.USER_LAST_CHAT.run(cur, (user.id,))
         last = cur.fetchone()[0]
         now = datetime.datetime.now()
 
@@ -415,13 +632,14 @@ class Bank(commands.Cog):
             return  # 1분 쿨타임
 
         try:
-            cur.execute(
-                "UPDATE users SET money = money + %s, last_chat_reward_at = %s WHERE uuid=%s",
-                (2, now, user.id)
-            )
+            q.CHAT_REWARD.run(cur, (2, now, user.id, PROCESS_TOKEN))
+            bal = cur.fetchone()[0]
             self.bot.conn.commit()
         except Exception:
             self.bot.conn.rollback()
+            self.balance_cache.invalidate(user.id)
+            return
+        self.balance_cache.set(user.id, bal)
 
     # ---------- 통화 보상 ----------
     async def pay_voice_rewards(self):
@@ -437,12 +655,14 @@ class Bank(commands.Cog):
                 return
 
             cur = self.bot.cursor
-            for uid in set(to_pay):
-                await self.ensure_user(uid)
-                cur.execute("UPDATE users SET money = money + 3 WHERE uuid=%s", (uid,))
+            q.MONEY_ADD_MANY.run(cur, (list(set(to_pay)), 3, PROCESS_TOKEN))
+            rows = cur.fetchall()
             self.bot.conn.commit()
+            self._cache_rows(rows)
         except Exception:
             self.bot.conn.rollback()
+            for uid in set(to_pay):
+                self.balance_cache.invalidate(uid)
 
 async def setup(bot: commands.Bot):
     await bot.add_cog(Bank(bot))
@@ -1,11 +1,20 @@
+import time
+
 import discord
 from discord import app_commands
 from discord.ext import commands
 
+from db import queries as q
+
+ALLOWED_CHANNELS_TTL = 30  # 초: 다른 프로세스의 채널 설정 변경이 반영되는 최대 지연
+
 
 class GuildSetting(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        # 허용 채널 캐시 (None 이면 다음 확인 때 DB에서 다시 읽음)
+        self._allowed_channels: set | None = None
+        self._allowed_loaded_at = 0.0
 
     async def setup_allowed_channels_table(self):
         """단일 서버: 허용 채널 여러 개 관리"""
@@ -45,6 +54,7 @@ class GuildSetting(commands.Cog):
                 ON CONFLICT (channel_id) DO NOTHING
             """, (interaction.channel.id,))
             self.bot.conn.commit()
+            self._allowed_channels = None
 
             await interaction.response.send_message(
                 f"{interaction.channel.mention} 채널이 **허용 채널**로 추가되었습니다.", ephemeral=True
@@ -71,6 +81,7 @@ class GuildSetting(commands.Cog):
             cursor.execute("DELETE FROM bot_allowed_channel WHERE channel_id = %s",
                            (interaction.channel.id,))
             self.bot.conn.commit()
+            self._allowed_channels = None
 
             await interaction.response.send_message(
                 f"{interaction.channel.mention} 채널이 **허용 채널**에서 제거되었습니다.", ephemeral=True
@@ -121,18 +132,24 @@ class GuildSetting(commands.Cog):
         """
         허용 채널이 하나도 없으면 모든 채널 허용.
         하나 이상 있으면, 현재 채널이 목록에 포함될 때만 허용.
+        목록은 ALLOWED_CHANNELS_TTL 동안 메모리에 캐시.
         """
+        if self._allowed_channels is not None and time.monotonic() - self._allowed_loaded_at < ALLOWED_CHANNELS_TTL:
+            return not self._allowed_channels or interaction.channel.id in self._allowed_channels
+
         cursor = None
         try:
             cursor = self.bot.get_cursor()
-            cursor.execute("SELECT channel_id FROM bot_allowed_channel")
+            q.ALLOWED_CHANNEL_IDS.run(cursor)
             rows = cursor.fetchall()
 
+            self._allowed_channels = {cid for (cid,) in rows}
+            self._allowed_loaded_at = time.monotonic()
+
             if not rows:
                 return True  # 설정이 없으면 전체 허용
 
-            allowed = {cid for (cid,) in rows}
-            return interaction.channel.id in allowed
+            return interaction.channel.id in self._allowed_channels
 
         except Exception as e:
             print(f"권한 확인 중 오류: {e}")
@@ -3,6 +3,8 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 
+from db import queries as q
+
 from os import getenv
 ADMIN_ID = int(getenv("ADMIN_ID", "0"))
 
@@ -36,7 +38,7 @@ class RoleSetting(commands.Cog):
     # 공개 헬퍼: 멤버가 허용 역할을 하나라도 가지고 있는가
     async def user_has_manager_role(self, member: discord.Member) -> bool:
         cur = self.bot.cursor
-        cur.execute("SELECT role_id FROM admin_allowed_role")
+        q.ADMIN_ROLE_IDS.run(cur)
         rows = cur.fetchall()
         if not rows:
             return False  # 등록된 역할이 없으면 False (ADMIN_ID/관리자 권한은 외부에서 별도로 체크)
@@ -0,0 +1,386 @@
+# snapshot.py (잔액 스냅샷: 주기 저장 + 추이 조회)
+
+import asyncio
+import datetime
+import heapq
+import zlib
+from contextlib import closing
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import discord
+from discord import app_commands
+from discord.ext import commands
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+
+SNAPSHOT_MAGIC = b"YS1"
+SNAPSHOT_INTERVAL_MINUTES = 60
+KEYFRAME_EVERY = 24          # 24개마다 전체 스냅샷(키프레임), 나머지는 직전 대비 변경분만
+RETENTION_DAYS = 90
+
+
+# ---------- 인코딩 ----------
+def _write_varint(buf: bytearray, value: int) -> None:
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            buf.append(byte | 0x80)
+        else:
+            buf.append(byte)
+            return
+
+
+def _read_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    result, shift = 0, 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result, pos
+        shift += 7
+
+
+def _zigzag(n: int) -> int:
+    return (n << 1) if n >= 0 else ((-n << 1) - 1)
+
+
+def _unzigzag(n: int) -> int:
+    return (n >> 1) if not n & 1 else -((n + 1) >> 1)
+
+
+def encode_entries(entries: List[Tuple[int, int]]) -> bytes:
+    """(uuid, 값) 목록 → uuid 오름차순 델타 + zigzag varint + zlib"""
+    buf = bytearray(SNAPSHOT_MAGIC)
+    _write_varint(buf, len(entries))
+    prev_uid = 0
+    for uid, value in sorted(entries):
+        _write_varint(buf, uid - prev_uid)
+        _write_varint(buf, _zigzag(value))
+        prev_uid = uid
+    return zlib.compress(bytes(buf), 9)
+
+
+def decode_entries(payload: bytes) -> Iterator[Tuple[int, int]]:
+    data = zlib.decompress(payload)
+    if not data.startswith(SNAPSHOT_MAGIC):
+        raise ValueError("알 수 없는 스냅샷 형식")
+    count, pos = _read_varint(data, len(SNAPSHOT_MAGIC))
+    uid = 0
+    for _ in range(count):
+        delta, pos = _read_varint(data, pos)
+        value, pos = _read_varint(data, pos)
+        uid += delta
+        yield uid, _unzigzag(value)
+
+
+def lookup_entry(payload: bytes, user_id: int) -> Optional[int]:
+    """한 사용자 값만 찾기 (uuid 오름차순이라 지나치면 바로 중단, dict 를 만들지 않음)"""
+    for uid, value in decode_entries(payload):
+        if uid == user_id:
+            return value
+        if uid > user_id:
+            return None
+    return None
+
+
+def _top_n(state: Dict[int, int], n: int) -> List[Tuple[int, int]]:
+    return heapq.nlargest(n, state.items(), key=lambda kv: (kv[1], -kv[0]))
+
+
+class BalanceSnapshot(commands.Cog):
+    """
+    전체 잔액을 주기적으로 압축 저장하고, 저장된 스냅샷만으로 추이를 조회
+    - 키프레임: 전체 (uuid, 잔액)
+    - 델타: 직전 스냅샷 대비 바뀐 (uuid, 증감)만
+    - /잔액추이 는 users 테이블을 건드리지 않음
+    DB: balance_snapshot(taken_at, is_keyframe, user_count, payload)
+    """
+
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+        self._create_table()
+
+        # 리로드 전 코그가 넘겨준 상태 (없으면 빈 dict)
+        state = bot.cog_state.pop(self.qualified_name, {})
+
+        # 직전 스냅샷 상태 (델타 계산용, 없으면 첫 캡처 때 DB에서 복원)
+        self._last_state: Optional[Dict[int, int]] = state.get("last_state")
+        self._since_keyframe = state.get("since_keyframe", 0)
+
+        self.scheduler = AsyncIOScheduler()
+        self.scheduler.start()
+        # 캡처는 게이트웨이 프로세스 하나만 (HTTP 인터랙션 워커는 조회만)
+        # next_run_time=None 은 '일시정지로 추가'라서, 이어받을 값이 있을 때만 넘김
+        if not bot.interactions_only:
+            resume = {"next_run_time": state["next_run"]} if state.get("next_run") else {}
+            self.scheduler.add_job(
+                self.capture_snapshot, "interval", minutes=SNAPSHOT_INTERVAL_MINUTES, max_instances=1, coalesce=True,
+                id="capture_snapshot", **resume,
+            )
+
+    async def cog_unload(self) -> None:
+        job = self.scheduler.get_job("capture_snapshot")
+        self.bot.cog_state[self.qualified_name] = {
+            "last_state": self._last_state,
+            "since_keyframe": self._since_keyframe,
+            "next_run": job.next_run_time if job else None,
+        }
+        self.scheduler.shutdown(wait=False)
+
+    # ---------- 공통 헬퍼 ----------
+    async def _deny(self, interaction: discord.Interaction, text: str) -> None:
+        await interaction.response.send_message(text, ephemeral=True)
+
+    async def check_bot_channel(self, interaction: discord.Interaction) -> bool:
+        settings_cog = self.bot.get_cog("GuildSetting")
+        if settings_cog is None:
+            return True
+        allowed = await settings_cog.check_channel_permission(interaction)
+        if not allowed:
+            await self._deny(interaction, "🚫 이 채널에서는 명령어를 사용할 수 없어요.")
+            return False
+        return True
+
+    # ---------- DB ----------
+    def _create_table(self) -> None:
+        cur = self.bot.cursor
+        cur.execute("""
+        CREATE TABLE IF NOT EXISTS balance_snapshot (
+            taken_at TIMESTAMP PRIMARY KEY,
+            is_keyframe BOOLEAN NOT NULL,
+            user_count INT NOT NULL,
+            payload BYTEA NOT NULL
+        )
+        """)
+        self.bot.conn.commit()
+
+    @classmethod
+    def _restore_last_state(cls, cur) -> Tuple[Optional[Dict[int, int]], int]:
+        """가장 최근 키프레임부터 재생해 (직전 상태, 키프레임 이후 개수) 복원"""
+        cur.execute("""
+            SELECT is_keyframe, payload FROM balance_snapshot
+            WHERE taken_at >= COALESCE(
+                (SELECT MAX(taken_at) FROM balance_snapshot WHERE is_keyframe), 'infinity'::timestamp
+            )
+            ORDER BY taken_at
+        """)
+        rows = cur.fetchall()
+        state: Dict[int, int] = {}
+        for is_keyframe, payload in rows:
+            cls._apply(state, bool(is_keyframe), bytes(payload))
+        return (state if rows else None), max(len(rows) - 1, 0)
+
+    @staticmethod
+    def _apply(state: Dict[int, int], is_keyframe: bool, payload: bytes) -> None:
+        if is_keyframe:
+            state.clear()
+            state.update(decode_entries(payload))
+        else:
+            for uid, diff in decode_entries(payload):
+                state[uid] = state.get(uid, 0) + diff
+
+    # ---------- 캡처 ----------
+    # 전체 users 조회 + 인코딩은 10만 명 규모에서 수 초가 걸리므로 전용 연결로 루프 밖(asyncio.to_thread)에서
+    def _capture_sync(
+            self, prev: Optional[Dict[int, int]], since_keyframe: int
+    ) -> Tuple[Dict[int, int], int]:
+        """스냅샷 1개 저장 → (현재 상태, 키프레임 이후 개수)"""
+        with closing(self.bot.new_db_connection()) as conn:
+            cur = conn.cursor()
+            if prev is None:
+                prev, since_keyframe = self._restore_last_state(cur)
+
+            cur.execute("SELECT uuid, money FROM users")
+            current = {uid: money or 0 for uid, money in cur.fetchall()}
+
+            is_keyframe = prev is None or since_keyframe + 1 >= KEYFRAME_EVERY
+            if is_keyframe:
+                entries = list(current.items())
+            else:
+                entries = [(uid, money - prev.get(uid, 0)) for uid, money in current.items()
+                           if money != prev.get(uid, 0)]
+
+            now = datetime.datetime.now()
+            cur.execute(
+                "INSERT INTO balance_snapshot (taken_at, is_keyframe, user_count, payload) VALUES (%s, %s, %s, %s)",
+                (now, is_keyframe, len(current), encode_entries(entries))
+            )
+            # 보관 기간이 지난 스냅샷 정리 (기준 시각 이후 첫 키프레임 이전만 삭제)
+            cur.execute("""
+                DELETE FROM balance_snapshot
+                WHERE taken_at < (
+                    SELECT MIN(taken_at) FROM balance_snapshot WHERE is_keyframe AND taken_at >= %s
+                )
+            """, (now - datetime.timedelta(days=RETENTION_DAYS),))
+            conn.commit()
+
+        return current, 0 if is_keyframe else since_keyframe + 1
+
+    async def capture_snapshot(self) -> None:
+        try:
+            self._last_state, self._since_keyframe = await asyncio.to_thread(
+                self._capture_sync, self._last_state, self._since_keyframe
+            )
+        except Exception as e:
+            print(f"❌ 잔액 스냅샷 저장 오류: {e}")
+
+    # ---------- 조회 API ----------
+    # 읽기/압축 해제/재생 모두 전용 연결로 루프 밖(asyncio.to_thread)에서
+    @staticmethod
+    def _fetch_range(cur, since: datetime.datetime) -> List[Tuple[datetime.datetime, bool, bytes]]:
+        """since 직전 키프레임부터 최신까지 (taken_at, is_keyframe, payload)"""
+        cur.execute("""
+            SELECT taken_at, is_keyframe, payload FROM balance_snapshot
+            WHERE taken_at >= COALESCE(
+                (SELECT MAX(taken_at) FROM balance_snapshot WHERE is_keyframe AND taken_at <= %s),
+                (SELECT MIN(taken_at) FROM balance_snapshot WHERE is_keyframe)
+            )
+            ORDER BY taken_at
+        """, (since,))
+        return [(taken_at, bool(is_keyframe), bytes(payload)) for taken_at, is_keyframe, payload in cur.fetchall()]
+
+    @classmethod
+    def _state_at(cls, cur, at: datetime.datetime) -> Dict[int, int]:
+        """at 시점 상태: 그 직전 키프레임 + 이후 델타만 읽어 재생"""
+        cur.execute("""
+            SELECT is_keyframe, payload FROM balance_snapshot
+            WHERE taken_at <= %s AND taken_at >= (
+                SELECT MAX(taken_at) FROM balance_snapshot WHERE is_keyframe AND taken_at <= %s
+            )
+            ORDER BY taken_at
+        """, (at, at))
+        state: Dict[int, int] = {}
+        for is_keyframe, payload in cur.fetchall():
+            cls._apply(state, bool(is_keyframe), bytes(payload))
+        return state
+
+    def _user_series(self, since: datetime.datetime, user_id: int) -> List[Tuple[datetime.datetime, int]]:
+        with closing(self.bot.new_db_connection()) as conn:
+            rows = self._fetch_range(conn.cursor(), since)
+        series, money = [], 0
+        for taken_at, is_keyframe, payload in rows:
+            value = lookup_entry(payload, user_id)
+            money = (value or 0) if is_keyframe else money + (value or 0)
+            if taken_at >= since:
+                series.append((taken_at, money))
+        return series
+
+    def _top_n_ends(self, since: datetime.datetime, n: int):
+        """기간 시작/끝 두 시점의 상위 N만 (각 시점의 직전 키프레임부터만 읽음)"""
+        with closing(self.bot.new_db_connection()) as conn:
+            cur = conn.cursor()
+            cur.execute(
+                "SELECT (SELECT MIN(taken_at) FROM balance_snapshot WHERE taken_at >= %s),"
+                " (SELECT MAX(taken_at) FROM balance_snapshot)",
+                (since,)
+            )
+            start_at, end_at = cur.fetchone()
+            if start_at is None:
+                return None
+            start_top = _top_n(self._state_at(cur, start_at), n)
+            end_top = start_top if end_at == start_at else _top_n(self._state_at(cur, end_at), n)
+        return (start_at, start_top), (end_at, end_top)
+
+    async def user_history(self, user_id: int, since: datetime.datetime) -> List[Tuple[datetime.datetime, int]]:
+        return await asyncio.to_thread(self._user_series, since, user_id)
+
+    async def top_n_change(self, since: datetime.datetime, n: int = 10):
+        """((시작 시각, 상위 N), (끝 시각, 상위 N)), 스냅샷이 없으면 None"""
+        return await asyncio.to_thread(self._top_n_ends, since, n)
+
+    def _has_snapshot_since(self, since: datetime.datetime) -> bool:
+        cur = self.bot.cursor
+        cur.execute("SELECT EXISTS (SELECT 1 FROM balance_snapshot WHERE taken_at >= %s)", (since,))
+        return bool(cur.fetchone()[0])
+
+    @staticmethod
+    def _daily(points: List[Tuple[datetime.datetime, object]]) -> List[Tuple[datetime.datetime, object]]:
+        """하루에 마지막 스냅샷 하나씩만"""
+        by_day: Dict[datetime.date, Tuple[datetime.datetime, object]] = {}
+        for taken_at, value in points:
+            by_day[taken_at.date()] = (taken_at, value)
+        return [by_day[d] for d in sorted(by_day)]
+
+    # ---------- 명령어 ----------
+    @app_commands.command(name="잔액추이", description="기간 동안의 령 잔액/순위 변화를 보여줍니다.")
+    @app_commands.choices(보기=[
+        app_commands.Choice(name="개인", value="user"),
+        app_commands.Choice(name="순위", value="top"),
+    ])
+    async def cmd_balance_trend(
+            self,
+            interaction: discord.Interaction,
+            사용자: discord.Member | None = None,
+            기간: app_commands.Range[int, 1, RETENTION_DAYS] = 7,
+            보기: app_commands.Choice[str] | None = None,
+    ):
+        if not await self.check_bot_channel(interaction):
+            return
+
+        since = datetime.datetime.now() - datetime.timedelta(days=기간)
+        # 공개 defer 뒤 첫 followup 은 그 메시지를 대신하므로 ephemeral 이 무시됨 → 거절은 defer 전에
+        try:
+            has_snapshot = self._has_snapshot_since(since)
+        except Exception:
+            self.bot.conn.rollback()
+            await self._deny(interaction, "⚠️ 잔액 추이를 불러오는 중 문제가 발생했어요.")
+            return
+        if not has_snapshot:
+            await self._deny(interaction, "⚠️ 아직 저장된 스냅샷이 없어요.")
+            return
+
+        # 기간이 길면 재생에 수 초가 걸릴 수 있어 먼저 응답 유예
+        await interaction.response.defer()
+
+        member = 사용자 or interaction.user
+        try:
+            if 보기 is not None and 보기.value == "top":
+                series = await self.top_n_change(since, 10)
+            else:
+                series = await self.user_history(member.id, since)
+        except Exception:
+            series = None
+        if not series:
+            # 유예 메시지를 지운 뒤라야 followup 이 새 에페메럴 메시지로 감
+            await interaction.delete_original_response()
+            await interaction.followup.send("⚠️ 잔액 추이를 불러오는 중 문제가 발생했어요.", ephemeral=True)
+            return
+
+        if 보기 is not None and 보기.value == "top":
+            (start_at, start_top), (end_at, end_top) = series
+            start_rank = {uid: (rank, money) for rank, (uid, money) in enumerate(start_top, start=1)}
+            lines = []
+            for rank, (uid, money) in enumerate(end_top, start=1):
+                m = interaction.guild.get_member(uid)
+                name = m.mention if m else f"(탈퇴/미확인) `{uid}`"
+                if uid in start_rank:
+                    prev_rank, prev_money = start_rank[uid]
+                    move = prev_rank - rank
+                    mark = f"▲{move}" if move > 0 else (f"▼{-move}" if move < 0 else "–")
+                    lines.append(f"{rank}. {name} — {money:,}령 ({mark}, {money - prev_money:+,}령)")
+                else:
+                    lines.append(f"{rank}. {name} — {money:,}령 (NEW)")
+            desc = (
+                f"{start_at:%m-%d %H:%M} → {end_at:%m-%d %H:%M} 상위 10명 변화\n\n" + "\n".join(lines)
+            )
+        else:
+            daily = self._daily(series)
+            lines = []
+            prev = None
+            for taken_at, money in daily:
+                change = "" if prev is None else f" ({money - prev:+,})"
+                lines.append(f"`{taken_at:%m-%d}` {money:,}령{change}")
+                prev = money
+            desc = f"{member.mention} 최근 {기간}일 잔액 추이\n\n" + "\n".join(lines[-15:])
+
+        embed = discord.Embed(
+            title="잔액 추이 📈",
+            description=desc,
+            color=discord.Color.blue()
+        )
+        await interaction.followup.send(embed=embed)
+
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(BalanceSnapshot(bot))
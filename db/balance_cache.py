@@ -0,0 +1,161 @@
+# balance_cache.py (잔액 LRU 캐시 + 프로세스 간 무효화)
+#
+# Bank 의 모든 쓰기 경로는 RETURNING 으로 받은 새 잔액을 바로 캐시에 씁니다(write-through).
+# 같은 쓰기 문장 안에서 pg_notify 로 변경된 uuid 를 알리고, 다른 프로세스는
+# LISTEN 으로 받아 자기 캐시에서 지웁니다. 자기 자신이 보낸 알림은 PROCESS_TOKEN 으로 걸러냅니다.
+# LISTEN 이 끊겨 있는 동안에는 알림을 놓치므로 캐시를 끄고(모두 미스, 쓰기 무시) DB만 봅니다.
+
+import asyncio
+import os
+import secrets
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+
+INVALIDATE_CHANNEL = "balance_invalidate"
+PROCESS_TOKEN = f"{os.getpid()}-{secrets.token_hex(4)}"
+RECONNECT_DELAY = 5
+
+
+class BalanceCache:
+    """uuid → 잔액, 최대 maxsize 개 (가장 오래 안 쓴 것부터 밀려남)"""
+
+    def __init__(self, maxsize: int = 10000):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[int, int]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.enabled = True
+
+    def __contains__(self, user_id: int) -> bool:
+        return user_id in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, user_id: int) -> Optional[int]:
+        money = self._data.get(user_id)
+        if money is None:
+            self.misses += 1
+            return None
+        self._data.move_to_end(user_id)
+        self.hits += 1
+        return money
+
+    def set(self, user_id: int, money: int) -> None:
+        if not self.enabled:
+            return
+        self._data[user_id] = money
+        self._data.move_to_end(user_id)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, user_id: int) -> None:
+        if self._data.pop(user_id, None) is not None:
+            self.invalidations += 1
+
+    def clear(self) -> None:
+        self.invalidations += len(self._data)
+        self._data.clear()
+
+    def disable(self) -> None:
+        """무효화 알림을 받을 수 없는 동안: 비우고 더 채우지 않음"""
+        self.clear()
+        self.enabled = False
+
+    def enable(self) -> None:
+        """LISTEN 이 다시 잡힌 뒤: 끊긴 사이 채워졌을 수 있는 값까지 비우고 다시 사용"""
+        self.clear()
+        self.enabled = True
+
+    def stats(self) -> Dict[str, float]:
+        total = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits / total) if total else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+class BalanceInvalidationListener:
+    """전용 연결로 LISTEN 하다가 다른 프로세스의 잔액 변경 알림을 받으면 캐시에서 제거"""
+
+    def __init__(self, cache: BalanceCache, connect: Callable):
+        self.cache = cache
+        self._connect = connect
+        self.conn = None
+        self._fd: Optional[int] = None  # add_reader 에 등록한 fd (연결이 죽으면 fileno() 를 못 부르므로 보관)
+        self._reconnect_handle: Optional[asyncio.TimerHandle] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        try:
+            self.conn = self._connect()
+            self.conn.autocommit = True
+            self.conn.cursor().execute(f"LISTEN {INVALIDATE_CHANNEL}")
+            fd = self.conn.fileno()
+            self._loop.add_reader(fd, self._on_readable)
+            self._fd = fd
+            self.cache.enable()
+        except NotImplementedError:
+            # add_reader 를 지원하지 않는 루프 (Windows Proactor): 재시도해도 같으니 포기
+            # 다른 프로세스(HTTP 워커 등)의 변경을 알 수 없으니 캐시 자체를 끔
+            print("⚠️ 이 이벤트 루프에서는 잔액 캐시 무효화 채널을 쓸 수 없어요. (잔액 캐시 꺼짐)")
+            self.stop()
+            self.cache.disable()
+        except Exception as e:
+            print(f"❌ 잔액 캐시 무효화 채널 연결 오류: {e}")
+            self._reconnect_later()
+
+    def stop(self) -> None:
+        if self._reconnect_handle is not None:
+            self._reconnect_handle.cancel()
+            self._reconnect_handle = None
+        if self._fd is not None:
+            try:
+                self._loop.remove_reader(self._fd)
+            except Exception:
+                pass
+            self._fd = None
+        if self.conn is not None:
+            try:
+                self.conn.close()
+            except Exception:
+                pass
+            self.conn = None
+
+    def _reconnect_later(self) -> None:
+        # 다시 연결될 때까지 알림을 놓치니 캐시를 끄고 재연결 예약 (이미 예약돼 있으면 그대로)
+        if self._reconnect_handle is not None:
+            return
+        self.stop()
+        self.cache.disable()
+        self._reconnect_handle = self._loop.call_later(RECONNECT_DELAY, self._reconnect)
+
+    def _reconnect(self) -> None:
+        self._reconnect_handle = None
+        self.start()
+
+    def _on_readable(self) -> None:
+        if self.conn is None:
+            return
+        try:
+            self.conn.poll()
+        except Exception as e:
+            print(f"⚠️ 잔액 캐시 무효화 채널 끊김: {e}")
+            self._reconnect_later()
+            return
+
+        while self.conn.notifies:
+            note = self.conn.notifies.pop(0)
+            token, _, uid = note.payload.partition(":")
+            if token != PROCESS_TOKEN and uid.isdigit():
+                self.cache.invalidate(int(uid))
@@ -0,0 +1,97 @@
+# queries.py (코그가 매 호출마다 실행하는 핫 SQL 모음)
+#
+# 모두 db.statements 레지스트리에 등록되어 연결마다 한 번 PREPARE 된 뒤 재사용됩니다.
+#   q.USER_EXISTS.run(cur, (user_id,))
+# 여기에 등록된 문장은 scripts/check_query_plans.py 가 실행 계획을 검사합니다.
+# 새 핫 쿼리를 추가하면 그쪽 기대치(EXPECTATIONS)도 함께 추가해주세요.
+
+from db.statements import register as _register
+
+
+# ---------- users: 단건 조회/생성 ----------
+USER_EXISTS = _register("user_exists", "SELECT 1 FROM users WHERE uuid=%s")
+USER_INSERT = _register("user_insert", "INSERT INTO users (uuid) VALUES (%s) ON CONFLICT (uuid) DO NOTHING")
+# 없으면 만들고(0령) 있으면 기존 잔액 → 한 번에 (params: uuid, uuid)
+USER_ENSURE_BALANCE = _register("user_ensure_balance", """
+    WITH ins AS (
+        INSERT INTO users (uuid) VALUES (%s) ON CONFLICT (uuid) DO NOTHING RETURNING money
+    )
+    SELECT money FROM ins
+    UNION ALL
+    SELECT money FROM users WHERE uuid=%s
+    LIMIT 1
+""")
+USER_SOBOK = _register("user_sobok", "SELECT money, last_sobok FROM users WHERE uuid=%s")
+USER_LAST_CHAT = _register("user_last_chat", "SELECT last_chat_reward_at FROM users WHERE uuid=%s")
+
+# ---------- users: 잔액 변경 ----------
+# 모두 RETURNING 으로 새 잔액을 돌려주고, 같은 문장에서 잔액 캐시 무효화 알림(pg_notify)을 보냄
+# 마지막 파라미터는 항상 balance_cache.PROCESS_TOKEN
+_NOTIFY = "pg_notify('balance_invalidate', %s::text || ':' || uuid)"
+
+# 없으면 만들면서 더함 (params: uuid, 금액, token)
+MONEY_ADD = _register("money_add", f"""
+    INSERT INTO users (uuid, money) VALUES (%s, %s)
+    ON CONFLICT (uuid) DO UPDATE SET money = users.money + EXCLUDED.money
+    RETURNING money, {_NOTIFY}
+""")
+# 없으면 0령으로 만들고, 있으면 0 아래로 내려가지 않게 뺌 (params: uuid, 금액, token)
+MONEY_SUB_FLOOR = _register("money_sub_floor", f"""
+    INSERT INTO users (uuid, money) VALUES (%s, 0)
+    ON CONFLICT (uuid) DO UPDATE SET money = GREATEST(users.money - %s, 0)
+    RETURNING money, {_NOTIFY}
+""")
+# 잔액이 충분할 때만 뺌, 행이 없으면 잔액 부족 (params: 금액, uuid, 금액, token)
+MONEY_SPEND = _register("money_spend", f"""
+    UPDATE users SET money = money - %s WHERE uuid=%s AND money >= %s
+    RETURNING money, {_NOTIFY}
+""")
+# 여러 명에게 같은 금액, uuid 중복 없이 (params: [uuid...], 금액, token)
+MONEY_ADD_MANY = _register("money_add_many", f"""
+    INSERT INTO users (uuid, money) SELECT unnest(%s::bigint[]), %s::bigint
+    ON CONFLICT (uuid) DO UPDATE SET money = users.money + EXCLUDED.money
+    RETURNING uuid, money, {_NOTIFY}
+""")
+# 사람마다 다른 금액, uuid 중복 없이 (params: [uuid...], [금액...], token)
+MONEY_ADD_EACH = _register("money_add_each", f"""
+    INSERT INTO users (uuid, money) SELECT * FROM unnest(%s::bigint[], %s::bigint[])
+    ON CONFLICT (uuid) DO UPDATE SET money = users.money + EXCLUDED.money
+    RETURNING uuid, money, {_NOTIFY}
+""")
+# (params: [uuid...], 금액, token)
+MONEY_SUB_FLOOR_MANY = _register("money_sub_floor_many", f"""
+    INSERT INTO users (uuid, money) SELECT unnest(%s::bigint[]), 0
+    ON CONFLICT (uuid) DO UPDATE SET money = GREATEST(users.money - %s, 0)
+    RETURNING uuid, money, {_NOTIFY}
+""")
+# (params: 금액, 시각, uuid, token)
+SOBOK_REWARD = _register("sobok_reward", f"""
+    UPDATE users SET money = money + %s, last_sobok = %s WHERE uuid=%s
+    RETURNING money, {_NOTIFY}
+""")
+CHAT_REWARD = _register("chat_reward", f"""
+    UPDATE users SET money = money + %s, last_chat_reward_at = %s WHERE uuid=%s
+    RETURNING money, {_NOTIFY}
+""")
+
+# ---------- users: 순위 ----------
+# (money DESC, uuid ASC) 인덱스로 상위 N은 인덱스 전용 스캔
+LEADERBOARD_TOP = _register("leaderboard_top", """
+    SELECT uuid, money
+    FROM users
+    ORDER BY money DESC, uuid ASC
+    LIMIT 10
+""")
+# RANK() OVER 전체 정렬 대신, 나보다 앞선 행 수를 인덱스 범위로 셈
+LEADERBOARD_MY_RANK = _register("leaderboard_my_rank", """
+    SELECT 1
+         + (SELECT COUNT(*) FROM users WHERE money > u.money)
+         + (SELECT COUNT(*) FROM users WHERE money = u.money AND uuid < u.uuid),
+           u.money
+    FROM users u
+    WHERE u.uuid = %s
+""")
+
+# ---------- 설정 테이블 ----------
+ADMIN_ROLE_IDS = _register("admin_role_ids", "SELECT role_id FROM admin_allowed_role")
+ALLOWED_CHANNEL_IDS = _register("allowed_channel_ids", "SELECT channel_id FROM bot_allowed_channel")
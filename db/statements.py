@@ -0,0 +1,86 @@
+# statements.py (이름 붙은 SQL 문장 레지스트리: 연결마다 한 번 PREPARE, 이후 EXECUTE)
+#
+# 등록한 문장은 처음 쓰일 때 해당 연결에서 PREPARE 되고, 이후에는 EXECUTE 로만 실행되어
+# 매 호출마다의 파싱/플래닝 비용이 없습니다. 문장별 호출 수/시간도 함께 기록합니다.
+#
+#   USER_EXISTS = register("user_exists", "SELECT 1 FROM users WHERE uuid=%s")
+#   USER_EXISTS.run(cur, (user_id,))
+#   row = cur.fetchone()
+
+import re
+import time
+from typing import Dict, Sequence, Set, Tuple
+
+import psycopg2
+import psycopg2.errors
+
+STATEMENTS: Dict[str, "Statement"] = {}
+
+# (id(연결), 백엔드 pid) → 그 연결에서 PREPARE 된 문장 이름들
+# 재연결하면 pid 가 바뀌므로 새 연결에서는 다시 PREPARE 됨
+_prepared: Dict[Tuple[int, int], Set[str]] = {}
+
+
+class Statement:
+    def __init__(self, name: str, sql: str):
+        self.name = name
+        self.sql = sql  # psycopg2 형식(%s) 원문: 실행 계획 검사 등에서 그대로 사용
+        counter = iter(range(1, sql.count("%s") + 1))
+        self.param_count = sql.count("%s")
+        self.prepare_sql = f"PREPARE {name} AS " + re.sub(r"%s", lambda _: f"${next(counter)}", sql)
+        if self.param_count:
+            self.execute_sql = f"EXECUTE {name} (" + ", ".join(["%s"] * self.param_count) + ")"
+        else:
+            self.execute_sql = f"EXECUTE {name}"
+
+        self.calls = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def _prepare(self, cur, prepared: Set[str]) -> None:
+        cur.execute(self.prepare_sql)
+        prepared.add(self.name)
+
+    def run(self, cur, params: Sequence = ()) -> None:
+        """필요하면 PREPARE 한 뒤 EXECUTE (결과는 cur.fetch* 로)"""
+        conn = cur.connection
+        prepared = _prepared.setdefault((id(conn), conn.get_backend_pid()), set())
+
+        start = time.perf_counter()
+        try:
+            if self.name not in prepared:
+                self._prepare(cur, prepared)
+            try:
+                cur.execute(self.execute_sql, params)
+            except psycopg2.errors.InvalidSqlStatementName:
+                # 같은 키로 보이는 다른 세션 등으로 기록이 어긋난 경우 한 번만 다시 준비
+                if not conn.autocommit:
+                    raise
+                self._prepare(cur, prepared)
+                cur.execute(self.execute_sql, params)
+        except Exception:
+            self.errors += 1
+            raise
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            self.calls += 1
+            self.total_ms += elapsed
+            self.max_ms = max(self.max_ms, elapsed)
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "total_ms": self.total_ms,
+            "avg_ms": (self.total_ms / self.calls) if self.calls else 0.0,
+            "max_ms": self.max_ms,
+        }
+
+
+def register(name: str, sql: str) -> Statement:
+    if name in STATEMENTS:
+        raise ValueError(f"이미 등록된 문장 이름: {name}")
+    stmt = Statement(name, sql)
+    STATEMENTS[name] = stmt
+    return stmt
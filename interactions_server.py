@@ -0,0 +1,210 @@
+# interactions_server.py (HTTP 인터랙션 엔드포인트 워커)
+#
+# 게이트웨이 연결 없이 슬래시 명령만 HTTP로 받아 처리하는 워커입니다.
+# 여러 개를 로드밸런서 뒤에 띄우고, 개발자 포털의 Interactions Endpoint URL 을 여기로 지정하면
+# 명령은 워커들이, on_message/보이스 보상/스냅샷은 main.py 게이트웨이 프로세스가 처리합니다.
+#
+#   DISCORD_PUBLIC_KEY=... INTERACTIONS_PORT=8080 python interactions_server.py
+#
+# 코그 코드는 그대로 재사용합니다. 요청 본문을 게이트웨이의 INTERACTION_CREATE 와 같은 경로
+# (ConnectionState.parse_interaction_create → CommandTree)로 흘려보내고, 첫 응답
+# (send_message/defer)은 Discord 콜백 API 대신 이 HTTP 응답 본문으로 돌려줍니다.
+
+import asyncio
+import datetime
+import os
+import time
+
+import discord
+from aiohttp import web
+from discord.webhook.async_ import AsyncWebhookAdapter, async_context
+from dotenv import load_dotenv
+from nacl.exceptions import BadSignatureError
+from nacl.signing import VerifyKey
+
+from main import AClient
+
+load_dotenv()
+
+PING = 1
+APPLICATION_COMMAND = 2
+AUTOCOMPLETE = 4
+RESPONSE_TIMEOUT = 2.8          # 디스코드는 3초 안에 첫 응답을 요구
+GUILD_REFRESH_MINUTES = 10      # 길드 역할/멤버 캐시 갱신 주기
+SIGNATURE_MAX_SKEW = 5          # 서명 타임스탬프 허용 오차 (초), 그보다 오래된 요청은 재전송으로 봄
+SEEN_ID_TTL = 60                # 처리한 인터랙션 id 기억 시간 (초, SIGNATURE_MAX_SKEW 보다 길게)
+
+
+class CapturingAdapter(AsyncWebhookAdapter):
+    """첫 인터랙션 응답을 콜백 API 대신 Future 로 받아둠 (후속 메시지/수정은 그대로 API 호출)"""
+
+    def __init__(self):
+        super().__init__()
+        self.response: asyncio.Future = asyncio.get_running_loop().create_future()
+
+    async def create_interaction_response(self, interaction_id, token, *, session, params, **kwargs):
+        if self.response.done() or params.multipart:
+            # 파일 첨부 응답은 HTTP 본문으로 돌려주지 않고 콜백 API 로 보냄
+            await super().create_interaction_response(interaction_id, token, session=session, params=params, **kwargs)
+            if not self.response.done():
+                self.response.set_result(None)
+            return
+        self.response.set_result(params.payload)
+
+
+class InteractionsServer:
+    def __init__(self, client: AClient, public_key: str):
+        self.client = client
+        self.verify_key = VerifyKey(bytes.fromhex(public_key))
+        self._guild_loaded_at: dict[int, datetime.datetime] = {}
+        self._seen_ids: dict[str, float] = {}  # 인터랙션 id → 만료 시각 (같은 요청 재전송 거절)
+
+    # ---------- 서명 검증 ----------
+    def verify(self, request: web.Request, body: bytes) -> bool:
+        signature = request.headers.get("X-Signature-Ed25519", "")
+        timestamp = request.headers.get("X-Signature-Timestamp", "")
+        try:
+            self.verify_key.verify(timestamp.encode() + body, bytes.fromhex(signature))
+        except (BadSignatureError, ValueError):
+            return False
+        # 서명은 맞아도 오래된 요청(로그 등에서 가져온 재전송)은 거절
+        return timestamp.isdecimal() and abs(time.time() - int(timestamp)) <= SIGNATURE_MAX_SKEW
+
+    def first_seen(self, interaction_id: str) -> bool:
+        """이 워커에서 처음 보는 인터랙션 id 면 기억하고 True (허용 오차 안의 재전송 방지)"""
+        now = time.monotonic()
+        for seen_id, expires in list(self._seen_ids.items()):
+            if expires > now:
+                break  # 삽입 순서 = 만료 순서
+            del self._seen_ids[seen_id]
+        if interaction_id in self._seen_ids:
+            return False
+        self._seen_ids[interaction_id] = now + SEEN_ID_TTL
+        return True
+
+    # ---------- 길드 캐시 ----------
+    async def ensure_guild(self, guild_id: int) -> None:
+        """
+        게이트웨이가 없으니 길드/역할/멤버 캐시를 REST로 채움.
+        (권한 체크의 역할 확인, 역할 전체 지급, 순위의 멤버 표시가 이 캐시를 씀)
+        멤버 목록은 다 불러온 뒤에만 client.members_loaded 에 표시 → 그 전엔 멤버 전체가 필요한 명령은 거절됨
+        """
+        loaded_at = self._guild_loaded_at.get(guild_id)
+        now = datetime.datetime.now()
+        if loaded_at and now - loaded_at < datetime.timedelta(minutes=GUILD_REFRESH_MINUTES):
+            return
+        self._guild_loaded_at[guild_id] = now
+
+        if self.client._connection._get_guild(guild_id) is not None:
+            # 갱신: 새 길드를 끝까지 채운 뒤 한 번에 교체 (그동안은 기존 캐시 사용)
+            self.client.loop.create_task(self._load_guild(guild_id))
+            return
+
+        # 처음: 역할 정보는 바로 필요하니 길드만 먼저 등록, 멤버는 백그라운드로
+        try:
+            guild = await self.client.fetch_guild(guild_id)
+        except discord.HTTPException as e:
+            print(f"⚠️ 길드 정보 조회 실패 ({guild_id}): {e}")
+            self._guild_loaded_at.pop(guild_id, None)
+            return
+        self.client._connection._add_guild(guild)
+        self.client.loop.create_task(self._load_members(guild))
+
+    async def _load_members(self, guild: discord.Guild) -> None:
+        try:
+            async for member in guild.fetch_members(limit=None):
+                guild._add_member(member)
+        except discord.HTTPException as e:
+            print(f"⚠️ 길드 멤버 조회 실패 ({guild.id}): {e}")
+            self._guild_loaded_at.pop(guild.id, None)  # 다음 요청 때 다시 시도
+            return
+        self.client.members_loaded.add(guild.id)
+
+    async def _load_guild(self, guild_id: int) -> None:
+        try:
+            guild = await self.client.fetch_guild(guild_id)
+            async for member in guild.fetch_members(limit=None):
+                guild._add_member(member)
+        except discord.HTTPException as e:
+            print(f"⚠️ 길드 갱신 실패 ({guild_id}): {e}")
+            self._guild_loaded_at.pop(guild_id, None)
+            return
+        self.client._connection._add_guild(guild)
+        self.client.members_loaded.add(guild_id)
+
+    # ---------- 라우트 ----------
+    async def handle_interaction(self, request: web.Request) -> web.Response:
+        body = await request.read()
+        if not self.verify(request, body):
+            return web.Response(status=401, text="invalid request signature")
+
+        data = await request.json()
+        if data.get("type") == PING:
+            return web.json_response({"type": 1})
+
+        if data.get("type") not in (APPLICATION_COMMAND, AUTOCOMPLETE):
+            return web.Response(status=400, text="unsupported interaction type")
+
+        if not self.first_seen(str(data.get("id"))):
+            return web.Response(status=409, text="duplicate interaction")
+
+        if data.get("guild_id"):
+            await self.ensure_guild(int(data["guild_id"]))
+
+        # 이 요청에서 만들어지는 명령 처리 태스크만 CapturingAdapter 를 보도록 컨텍스트에 설정
+        adapter = CapturingAdapter()
+        token = async_context.set(adapter)
+        try:
+            self.client._connection.parse_interaction_create(data)
+        finally:
+            async_context.reset(token)
+
+        try:
+            payload = await asyncio.wait_for(asyncio.shield(adapter.response), RESPONSE_TIMEOUT)
+        except asyncio.TimeoutError:
+            print(f"❌ 인터랙션 응답 시간 초과: {data.get('data', {}).get('name')}")
+            return web.Response(status=500, text="no response from handler")
+
+        if payload is None:
+            return web.Response(status=202)
+        return web.json_response(payload)
+
+    async def handle_health(self, request: web.Request) -> web.Response:
+        return web.Response(text="ok")
+
+    def make_app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_post("/interactions", self.handle_interaction)
+        app.router.add_get("/healthz", self.handle_health)
+        return app
+
+
+async def run() -> None:
+    public_key = os.getenv("DISCORD_PUBLIC_KEY")
+    if not public_key:
+        raise SystemExit("❌ DISCORD_PUBLIC_KEY 가 필요해요.")
+
+    client = AClient(interactions_only=True)
+    async with client:
+        # 게이트웨이 연결 없이 로그인만 (REST 세션 + setup_hook 에서 코그 로드)
+        await client.login(os.getenv("DISCORD_TOKEN"))
+
+        server = InteractionsServer(client, public_key)
+        runner = web.AppRunner(server.make_app())
+        await runner.setup()
+        host = os.getenv("INTERACTIONS_HOST", "0.0.0.0")
+        port = int(os.getenv("INTERACTIONS_PORT", "8080"))
+        await web.TCPSite(runner, host, port).start()
+        print(f"✅ 인터랙션 엔드포인트: http://{host}:{port}/interactions")
+
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await runner.cleanup()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        print("🛑 인터랙션 워커가 중지되었습니다.")
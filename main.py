@@ -9,16 +9,45 @@ from dotenv import load_dotenv
 load_dotenv()
 
 class AClient(commands.Bot):
-    def __init__(self):
+    def __init__(self, interactions_only: bool = False):
         intents = discord.Intents.default()
         intents.members = True  # Server Members Intent 사용
 
         super().__init__(command_prefix="!", intents=intents)
         self.synced = False
+        # True: 게이트웨이 없이 HTTP 인터랙션만 처리하는 워커 (interactions_server.py)
+        #       보이스 보상/스냅샷 같은 주기 작업과 명령어 동기화는 게이트웨이 프로세스 몫
+        self.interactions_only = interactions_only
+        self.members_loaded = set()  # 워커 모드: 멤버 목록을 끝까지 불러온 길드 id
         self.start_time = datetime.datetime.now()  # 업타임 기준 시각
+        self.cog_state = {}  # 코그 리로드 시 메모리 상태 인계 (코그 이름 → dict)
         self.setup_db_connection()
 
+    # --------- 코그 상태 인계 ----------
+    def discard_cog_state(self) -> None:
+        """리로드 후에도 아무 코그가 받아가지 않은 상태 정리 (LISTEN 연결 등)"""
+        for name, state in list(self.cog_state.items()):
+            discard = state.get("discard")
+            if discard is not None:
+                try:
+                    discard()
+                except Exception as e:
+                    print(f"⚠️ {name} 코그 상태 정리 오류: {e}")
+        self.cog_state.clear()
+
+    async def close(self):
+        await super().close()  # 익스텐션 언로드 → cog_unload 가 상태를 넘겨둠
+        self.discard_cog_state()
+
     # --------- 유틸 ----------
+    def members_ready(self, guild) -> bool:
+        """역할 구성원처럼 길드 멤버 전체가 필요한 명령 전에 확인"""
+        if guild is None:
+            return False
+        if self.interactions_only:
+            return guild.id in self.members_loaded
+        return True  # 게이트웨이는 Members Intent 로 시작 시 멤버를 모두 받음
+
     @staticmethod
     def format_uptime(delta: datetime.timedelta) -> str:
         days = delta.days
@@ -33,6 +62,10 @@ class AClient(commands.Bot):
             if filename.endswith(".py"):
                 await self.load_extension(f"cogs.{filename[:-3]}")
 
+        if self.interactions_only:
+            print("✅ 인터랙션 워커 준비 완료")
+            return
+
         # 슬래시 동기화 1회
         if not self.synced:
             await self.tree.sync()
@@ -47,16 +80,21 @@ class AClient(commands.Bot):
         print(f"✅ {self.user} 로그인 완료")
 
     # --------- DB ----------
+    @staticmethod
+    def new_db_connection():
+        """같은 설정으로 새 연결 (LISTEN 등 전용 연결이 필요할 때)"""
+        return psycopg2.connect(
+            dbname=os.getenv("DB_NAME"),
+            user=os.getenv("DB_USER"),
+            password=os.getenv("DB_PASSWORD"),
+            host=os.getenv("DB_HOST"),
+            sslmode='prefer',
+            connect_timeout=10,
+        )
+
     def setup_db_connection(self):
         try:
-            self.conn = psycopg2.connect(
-                dbname=os.getenv("DB_NAME"),
-                user=os.getenv("DB_USER"),
-                password=os.getenv("DB_PASSWORD"),
-                host=os.getenv("DB_HOST"),
-                sslmode='prefer',
-                connect_timeout=10,
-            )
+            self.conn = self.new_db_connection()
             self.conn.autocommit = True
             self.cursor = self.conn.cursor()
         except Exception as e:
@@ -92,11 +130,12 @@ class AClient(commands.Bot):
                 print(f"❌ 상태 업데이트 오류: {e}")
                 await asyncio.sleep(5)
 
-client = AClient()
+if __name__ == "__main__":
+    client = AClient()
 
-try:
-    client.run(os.getenv("DISCORD_TOKEN"))
-except KeyboardInterrupt:
-    print("🛑 봇이 중지되었습니다.")
-except Exception as e:
-    print(f"❌ 봇 실행 중 오류 발생: {e}")
+    try:
+        client.run(os.getenv("DISCORD_TOKEN"))
+    except KeyboardInterrupt:
+        print("🛑 봇이 중지되었습니다.")
+    except Exception as e:
+        print(f"❌ 봇 실행 중 오류 발생: {e}")
@@ -0,0 +1,222 @@
+# check_query_plans.py (핫 SQL 실행 계획 회귀 검사)
+#
+# 로컬/CI용 Postgres에 대량 합성 데이터를 넣고, db/queries.py 에 등록된 모든 문장을
+# EXPLAIN (ANALYZE, BUFFERS) 로 실행해 계획 모양과 버퍼/시간 예산을 검사합니다.
+# 봇은 문장을 PREPARE 해서 쓰므로, 일반 계획(force_generic_plan)으로도 한 번 더 검사합니다.
+# 운영 DB에는 절대 연결하지 마세요. 전용 스키마(plan_check)를 지웠다가 다시 만듭니다.
+#
+#   PLAN_CHECK_DSN="dbname=ys_plan user=postgres host=localhost" python scripts/check_query_plans.py
+#
+# 하나라도 어긋나면 종료 코드 1.
+
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import sys
+from types import SimpleNamespace
+from typing import Any, Dict, List, Tuple
+
+import psycopg2
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cogs.bank import Bank  # noqa: E402
+from cogs.guildSetting import GuildSetting  # noqa: E402
+from cogs.role import RoleSetting  # noqa: E402
+import db.queries  # noqa: E402,F401  (문장 등록)
+from db.statements import STATEMENTS, Statement  # noqa: E402
+
+SCHEMA = "plan_check"
+
+# 표본 uuid: 합성 데이터는 1..rows, 잔액은 uuid에 따라 치우치게 분포
+MID_UID = 1000
+LOW_UID = 7  # 잔액 하위권 → 내 순위 계산의 최악 경우
+
+NOW = datetime.datetime.now()
+TOKEN = "plan-check"
+ROLE_UIDS = list(range(1, 100_000, 200))  # 역할 전체 지급 500명
+
+# name → (params, 기대치)
+#   no_seq_scan: 해당 테이블에 Seq Scan 금지
+#   index_only: 해당 테이블은 Index Only Scan 으로만 읽어야 함
+#   forbid_nodes: 나오면 안 되는 노드 종류
+#   max_buffers: shared hit + read 상한
+#   max_ms: 실행 시간 상한
+EXPECTATIONS: Dict[str, Tuple[tuple, Dict[str, Any]]] = {
+    "user_exists": ((MID_UID,), dict(no_seq_scan=("users",), max_buffers=10, max_ms=5)),
+    "user_insert": ((10**12,), dict(max_buffers=30, max_ms=5)),
+    "user_ensure_balance": ((MID_UID, MID_UID), dict(no_seq_scan=("users",), max_buffers=30, max_ms=5)),
+    "user_sobok": ((MID_UID,), dict(no_seq_scan=("users",), max_buffers=10, max_ms=5)),
+    "user_last_chat": ((MID_UID,), dict(no_seq_scan=("users",), max_buffers=10, max_ms=5)),
+    "money_add": ((MID_UID, 10, TOKEN), dict(no_seq_scan=("users",), max_buffers=30, max_ms=5)),
+    "money_sub_floor": ((MID_UID, 10, TOKEN), dict(no_seq_scan=("users",), max_buffers=30, max_ms=5)),
+    "money_spend": ((10, MID_UID, 10, TOKEN), dict(no_seq_scan=("users",), max_buffers=30, max_ms=5)),
+    "money_add_many": ((ROLE_UIDS, 10, TOKEN), dict(no_seq_scan=("users",), max_buffers=3000, max_ms=50)),
+    "money_add_each": ((ROLE_UIDS, [10] * len(ROLE_UIDS), TOKEN), dict(
+        no_seq_scan=("users",), max_buffers=3000, max_ms=50,
+    )),
+    "money_sub_floor_many": ((ROLE_UIDS, 10, TOKEN), dict(no_seq_scan=("users",), max_buffers=3000, max_ms=50)),
+    "sobok_reward": ((10, NOW, MID_UID, TOKEN), dict(no_seq_scan=("users",), max_buffers=30, max_ms=5)),
+    "chat_reward": ((2, NOW, MID_UID, TOKEN), dict(no_seq_scan=("users",), max_buffers=30, max_ms=5)),
+    "leaderboard_top": ((), dict(
+        no_seq_scan=("users",), index_only=("users",), forbid_nodes=("Sort",), max_buffers=20, max_ms=5,
+    )),
+    "leaderboard_my_rank": ((LOW_UID,), dict(
+        no_seq_scan=("users",), forbid_nodes=("Sort", "WindowAgg"), max_buffers=3000, max_ms=150,
+    )),
+    "admin_role_ids": ((), dict(max_buffers=10, max_ms=5)),
+    "allowed_channel_ids": ((), dict(max_buffers=10, max_ms=5)),
+}
+
+
+# ---------- 스키마/데이터 ----------
+def create_schema(conn) -> None:
+    """코그의 테이블 생성 코드를 그대로 재사용해 스키마가 어긋나지 않게 함"""
+    cur = conn.cursor()
+    cur.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+    cur.execute(f"CREATE SCHEMA {SCHEMA}")
+    cur.execute(f"SET search_path TO {SCHEMA}")
+
+    fake_bot = SimpleNamespace(conn=conn, cursor=cur, get_cursor=conn.cursor)
+    Bank._create_or_migrate_tables(SimpleNamespace(bot=fake_bot))
+    RoleSetting._create_table(SimpleNamespace(bot=fake_bot))
+    asyncio.run(GuildSetting.setup_allowed_channels_table(SimpleNamespace(bot=fake_bot)))
+    conn.commit()
+
+
+def seed(conn, rows: int) -> None:
+    cur = conn.cursor()
+    # 잔액은 소수 상위권 + 다수 하위권, 동점도 섞이도록
+    cur.execute("""
+        INSERT INTO users (uuid, money, last_sobok, last_chat_reward_at)
+        SELECT g,
+               CASE WHEN g %% 100 = 0 THEN (random() * 1000000)::bigint
+                    ELSE (random() * 500)::bigint END + (g %% 7),
+               NOW() - (random() * interval '7 days'),
+               NOW() - (random() * interval '1 day')
+        FROM generate_series(1, %s) AS g
+    """, (rows,))
+    # 하위권 표본은 항상 0령
+    cur.execute("UPDATE users SET money = 0 WHERE uuid = %s", (LOW_UID,))
+    cur.execute("INSERT INTO admin_allowed_role (role_id) SELECT g FROM generate_series(1, 5) AS g")
+    cur.execute("INSERT INTO bot_allowed_channel (channel_id) SELECT g FROM generate_series(1, 3) AS g")
+    conn.commit()
+
+    # 가시성 맵 갱신 → 인덱스 전용 스캔 가능
+    conn.autocommit = True
+    cur.execute("VACUUM ANALYZE users")
+    cur.execute("VACUUM ANALYZE admin_allowed_role")
+    cur.execute("VACUUM ANALYZE bot_allowed_channel")
+    conn.autocommit = False
+
+
+# ---------- 계획 검사 ----------
+def _walk(node: Dict[str, Any]):
+    yield node
+    for child in node.get("Plans", []):
+        yield from _walk(child)
+
+
+def explain(conn, stmt: Statement, params: tuple, generic: bool) -> Dict[str, Any]:
+    cur = conn.cursor()
+    prepared = False
+    try:
+        if generic:
+            # 봇과 같은 경로: PREPARE 후 EXECUTE, 파라미터 값을 모르는 일반 계획
+            cur.execute("SET LOCAL plan_cache_mode = force_generic_plan")
+            cur.execute(stmt.prepare_sql)
+            prepared = True
+            cur.execute("EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + stmt.execute_sql, params)
+        else:
+            cur.execute("EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + stmt.sql, params)
+        plan = cur.fetchone()[0]
+    finally:
+        conn.rollback()  # 쓰기 문장도 실제로 남기지 않음
+        if prepared:
+            # PREPARE 가 실패했으면 DEALLOCATE 오류가 원래 오류를 가리므로 성공했을 때만
+            conn.cursor().execute(f"DEALLOCATE {stmt.name}")
+            conn.commit()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]
+
+
+def check(name: str, result: Dict[str, Any], expect: Dict[str, Any]) -> List[str]:
+    root = result["Plan"]
+    nodes = list(_walk(root))
+    problems = []
+
+    for table in expect.get("no_seq_scan", ()):
+        if any(n["Node Type"] == "Seq Scan" and n.get("Relation Name") == table for n in nodes):
+            problems.append(f"{table} Seq Scan")
+
+    for table in expect.get("index_only", ()):
+        scans = {n["Node Type"] for n in nodes if n.get("Relation Name") == table}
+        if scans != {"Index Only Scan"}:
+            problems.append(f"{table} 스캔이 인덱스 전용이 아님: {sorted(scans)}")
+
+    for node_type in expect.get("forbid_nodes", ()):
+        if any(n["Node Type"] == node_type for n in nodes):
+            problems.append(f"{node_type} 노드")
+
+    buffers = root.get("Shared Hit Blocks", 0) + root.get("Shared Read Blocks", 0)
+    if buffers > expect.get("max_buffers", float("inf")):
+        problems.append(f"버퍼 {buffers} > {expect['max_buffers']}")
+
+    ms = result.get("Execution Time", 0.0)
+    if ms > expect.get("max_ms", float("inf")):
+        problems.append(f"시간 {ms:.2f}ms > {expect['max_ms']}ms")
+
+    return problems
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="핫 SQL 실행 계획 회귀 검사")
+    parser.add_argument("--dsn", default=os.getenv("PLAN_CHECK_DSN"), help="검사용 Postgres DSN (PLAN_CHECK_DSN)")
+    parser.add_argument("--rows", type=int, default=200_000, help="합성 users 행 수")
+    args = parser.parse_args()
+
+    if not args.dsn:
+        print("❌ PLAN_CHECK_DSN(또는 --dsn)을 지정해주세요.")
+        return 2
+
+    conn = psycopg2.connect(args.dsn)
+    try:
+        create_schema(conn)
+        seed(conn, args.rows)
+
+        failed = False
+        unregistered = sorted(set(STATEMENTS) - set(EXPECTATIONS))
+        for name in unregistered:
+            print(f"❌ {name}: 기대치가 등록되지 않은 핫 쿼리")
+            failed = True
+
+        for name, stmt in STATEMENTS.items():
+            if name not in EXPECTATIONS:
+                continue
+            params, expect = EXPECTATIONS[name]
+            for generic in (False, True):
+                result = explain(conn, stmt, params, generic)
+                problems = check(name, result, expect)
+                root = result["Plan"]
+                buffers = root.get("Shared Hit Blocks", 0) + root.get("Shared Read Blocks", 0)
+                label = f"{name}{' (prepared)' if generic else ''}"
+                summary = f"{label}: {root['Node Type']}, 버퍼 {buffers}, {result.get('Execution Time', 0.0):.2f}ms"
+                if problems:
+                    failed = True
+                    print(f"❌ {summary} — " + "; ".join(problems))
+                else:
+                    print(f"✅ {summary}")
+    finally:
+        conn.rollback()
+        conn.cursor().execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        conn.commit()
+        conn.close()
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+# send_test_interaction.py (로컬 인터랙션 워커에 서명된 가짜 요청 보내기)
+#
+# 1) 테스트용 키 만들기 → 출력된 public key 로 워커 실행
+#      python scripts/send_test_interaction.py keygen
+#      DISCORD_PUBLIC_KEY=<public> python interactions_server.py
+# 2) 요청 보내기
+#      python scripts/send_test_interaction.py ping --key <signing>
+#      python scripts/send_test_interaction.py command 지갑 --key <signing> --user-id 123
+#      python scripts/send_test_interaction.py command 지급 --key <signing> --option 금액=100 --option 사유=test
+#    --bad-signature 를 붙이면 401 이 나와야 정상
+
+import argparse
+import json
+import secrets
+import time
+import urllib.error
+import urllib.request
+
+from nacl.signing import SigningKey
+
+
+def _snowflake() -> str:
+    # 2015년 기준 밀리초 << 22
+    return str((int(time.time() * 1000) - 1420070400000) << 22 | secrets.randbits(22))
+
+
+def build_command(args) -> dict:
+    options = []
+    for opt in args.option:
+        name, _, value = opt.partition("=")
+        # 숫자면 정수(4), 아니면 문자열(3) 옵션
+        if value.lstrip("-").isdigit():
+            options.append({"name": name, "type": 4, "value": int(value)})
+        else:
+            options.append({"name": name, "type": 3, "value": value})
+
+    return {
+        "id": _snowflake(),
+        "application_id": args.application_id,
+        "type": 2,
+        "token": secrets.token_urlsafe(32),
+        "version": 1,
+        "guild_id": args.guild_id,
+        "channel_id": args.channel_id,
+        "channel": {"id": args.channel_id, "type": 0, "guild_id": args.guild_id, "name": "test"},
+        "locale": "ko",
+        "guild_locale": "ko",
+        "app_permissions": "0",
+        "entitlements": [],
+        "authorizing_integration_owners": {},
+        "context": 0,
+        "member": {
+            "user": {"id": args.user_id, "username": "tester", "discriminator": "0", "avatar": None,
+                     "global_name": "tester"},
+            "roles": [],
+            "permissions": str(args.permissions),
+            "joined_at": "2024-01-01T00:00:00+00:00",
+            "deaf": False,
+            "mute": False,
+            "flags": 0,
+        },
+        "data": {"id": _snowflake(), "name": args.name, "type": 1, "options": options},
+    }
+
+
+def send(url: str, key: SigningKey, payload: dict, bad_signature: bool) -> None:
+    body = json.dumps(payload).encode()
+    timestamp = str(int(time.time()))
+    signature = key.sign(timestamp.encode() + body).signature.hex()
+    if bad_signature:
+        signature = "00" * 64
+
+    req = urllib.request.Request(url, data=body, method="POST", headers={
+        "Content-Type": "application/json",
+        "X-Signature-Ed25519": signature,
+        "X-Signature-Timestamp": timestamp,
+    })
+    try:
+        with urllib.request.urlopen(req, timeout=10) as resp:
+            print(resp.status, resp.read().decode() or "(본문 없음)")
+    except urllib.error.HTTPError as e:
+        print(e.code, e.read().decode())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="서명된 가짜 인터랙션 요청")
+    sub = parser.add_subparsers(dest="mode", required=True)
+
+    sub.add_parser("keygen", help="테스트용 Ed25519 키 쌍 생성")
+
+    for mode in ("ping", "command"):
+        p = sub.add_parser(mode)
+        if mode == "command":
+            p.add_argument("name", help="슬래시 명령 이름 (예: 지갑)")
+            p.add_argument("--option", action="append", default=[], help="이름=값 (여러 번)")
+            p.add_argument("--user-id", default="100000000000000001")
+            p.add_argument("--guild-id", default="100000000000000002")
+            p.add_argument("--channel-id", default="100000000000000003")
+            p.add_argument("--application-id", default="100000000000000004")
+            p.add_argument("--permissions", type=int, default=0, help="멤버 권한 비트 (관리자=8)")
+        p.add_argument("--key", required=True, help="keygen 의 signing key (hex)")
+        p.add_argument("--url", default="http://127.0.0.1:8080/interactions")
+        p.add_argument("--bad-signature", action="store_true")
+
+    args = parser.parse_args()
+
+    if args.mode == "keygen":
+        key = SigningKey.generate()
+        print(f"signing key : {key.encode().hex()}")
+        print(f"public key  : {key.verify_key.encode().hex()}")
+        return
+
+    key = SigningKey(bytes.fromhex(args.key))
+    payload = {"type": 1} if args.mode == "ping" else build_command(args)
+    send(args.url, key, payload, args.bad_signature)
+
+
+if __name__ == "__main__":
+    main()